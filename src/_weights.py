@@ -0,0 +1,108 @@
+"""
+Numeric kernels for skill weighting and match quality.
+
+Works on floats, ints and NumPy arrays only (no pydantic models or enums), so models.py can call it
+for single jobs and whole batches alike.
+"""
+
+import bisect
+import math
+
+import numpy as np
+
+EXPERIENCE_THRESHOLD = 5.0
+CORE_WEIGHT_FACTOR_MAX = 0.6  # At 0 years experience
+REQUIRED_MULTIPLIER = 3.0     # 3x weight for required skills
+NICE_TO_HAVE_MULTIPLIER = 1.0  # 1x weight for nice-to-have skills
+
+# Senior role weights (when core weight becomes 0)
+TECHNICAL_TOOL_WEIGHT = 0.9
+TECHNICAL_SOFT_WEIGHT = 0.1
+LEADERSHIP_TOOL_WEIGHT = 0.4
+LEADERSHIP_SOFT_WEIGHT = 0.6
+
+# Integer codes for skill and role types
+CORE, SOFT, TOOL = 0, 1, 2
+TECHNICAL, LEADERSHIP = 0, 1
+
+# Senior-role factor per [role code, skill type code]; core skills are weighted separately
+ROLE_FACTORS_TABLE = np.array([
+    [0.0, TECHNICAL_SOFT_WEIGHT, TECHNICAL_TOOL_WEIGHT],
+    [0.0, LEADERSHIP_SOFT_WEIGHT, LEADERSHIP_TOOL_WEIGHT],
+])
+
+# Lower bounds of each match quality band, checked with bisect_right so each bound is inclusive;
+# the smallest positive float makes any score > 0.0 at least the second-lowest band
+QUALITY_THRESHOLDS = (math.nextafter(0.0, 1.0), 0.4, 0.6, 0.7, 0.8, 0.9)
+QUALITY_THRESHOLDS_ARRAY = np.array(QUALITY_THRESHOLDS)
+
+
+def skill_weights(
+    types: np.ndarray,
+    required: np.ndarray,
+    base_weights: np.ndarray,
+    skill_counts: np.ndarray,
+    years: np.ndarray,
+    roles: np.ndarray,
+) -> np.ndarray:
+    """Normalized weights for the concatenated skills of several jobs.
+
+    ``types``, ``required`` and ``base_weights`` hold one entry per skill, grouped by job;
+    ``skill_counts``, ``years`` and ``roles`` hold one entry per job.
+    """
+    job_count = len(skill_counts)
+    total_skills = len(types)
+    job_index = np.repeat(np.arange(job_count), skill_counts)
+
+    # Count skills by type from JOB requirements (not candidate), one row per job
+    type_counts = np.bincount(job_index * 3 + types, minlength=job_count * 3).reshape(job_count, 3)
+    core_counts = type_counts[:, CORE]
+    other_counts = skill_counts - core_counts
+
+    # Core weight factor decreases linearly from 0.6 to 0 over 5 years
+    # 0 years: 0.6, 1 year: 0.48, 2 years: 0.36, 3 years: 0.24, 4 years: 0.12, 5+ years: 0
+    core_weight_factors = np.maximum(0.0, CORE_WEIGHT_FACTOR_MAX * (1 - years / EXPERIENCE_THRESHOLD))
+    remaining_weights = 1.0 - core_weight_factors
+    core_type_weights = core_weight_factors / np.maximum(core_counts, 1)
+
+    # Senior positions (5+ years) distribute by role type, junior ones equally among non-core skills;
+    # denominators are clamped to 1 where the count is zero since those entries are never selected
+    is_senior = (years >= EXPERIENCE_THRESHOLD)[job_index]
+    senior_weights = (remaining_weights[job_index] * ROLE_FACTORS_TABLE[roles[job_index], types]
+                      / np.maximum(type_counts[job_index, types], 1))
+    junior_weights = remaining_weights[job_index] / np.maximum(other_counts[job_index], 1)
+    non_core_type_weights = np.where(is_senior, senior_weights, junior_weights)
+
+    type_weights = np.where(types == CORE, core_type_weights[job_index], non_core_type_weights)
+
+    # Unnormalized weight (base_weight * type_weight * requirement_multiplier)
+    requirement_multipliers = np.where(required, REQUIRED_MULTIPLIER, NICE_TO_HAVE_MULTIPLIER)
+    unnormalized_weights = base_weights * type_weights * requirement_multipliers
+
+    # Per-job normalization totals; reduceat only sees non-empty jobs since it mishandles empty segments
+    totals = np.zeros(job_count)
+    non_empty = skill_counts > 0
+    if total_skills:
+        starts = np.cumsum(skill_counts) - skill_counts
+        totals[non_empty] = np.add.reduceat(unnormalized_weights, starts[non_empty])
+    skill_totals = totals[job_index]
+
+    # Start from the fallback for jobs whose weights are all 0 (shouldn't happen in normal cases),
+    # an equal share per skill, and divide in place wherever the job has a non-zero total
+    weights = 1.0 / np.maximum(skill_counts, 1)[job_index]
+    np.divide(unnormalized_weights, skill_totals, out=weights, where=skill_totals > 0)
+    return weights
+
+
+def quality_index(score: float) -> int:
+    """Index of the match quality band a score falls in, 0 for no match (including NaN)."""
+    # NaN compares false against every threshold, which would otherwise sort it into the top band
+    if math.isnan(score):
+        return 0
+    return bisect.bisect_right(QUALITY_THRESHOLDS, score)
+
+
+def quality_indices(scores: np.ndarray) -> np.ndarray:
+    """Vectorized quality_index: band index for every score in one searchsorted call."""
+    scores = np.asarray(scores, dtype=np.float64)
+    return np.where(np.isnan(scores), 0, np.searchsorted(QUALITY_THRESHOLDS_ARRAY, scores, side="right"))
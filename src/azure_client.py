@@ -2,10 +2,16 @@
 Azure OpenAI client wrapper for embedding generation.
 """
 
+import httpx
 import numpy as np
 import os
 from typing import List, Optional
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI, AzureOpenAI
+
+try:
+    import simsimd
+except ImportError:  # optional SIMD backend, fall back to NumPy
+    simsimd = None
 
 
 class AzureEmbeddingClient:
@@ -17,8 +23,13 @@ class AzureEmbeddingClient:
         api_key: Optional[str] = None,
         api_version: str = "2024-02-01",
         embedding_model: str = "text-embedding-ada-002",
+        http_client: Optional[httpx.Client] = None,
+        async_http_client: Optional[httpx.AsyncClient] = None,
     ):
-        """Initialize Azure OpenAI client."""
+        """Initialize Azure OpenAI client.
+
+        Pass http_client / async_http_client to share one keep-alive connection pool between clients.
+        """
         self.endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
         self.api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
         self.api_version = api_version
@@ -38,12 +49,19 @@ class AzureEmbeddingClient:
             azure_endpoint=self.endpoint,
             api_key=self.api_key,
             api_version=self.api_version,
+            http_client=http_client,
+        )
+        self.async_client = AsyncAzureOpenAI(
+            azure_endpoint=self.endpoint,
+            api_key=self.api_key,
+            api_version=self.api_version,
+            http_client=async_http_client,
         )
 
         self.api_calls_made = 0
 
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings using Azure OpenAI."""
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings using Azure OpenAI as a float32 array of shape (len(texts), dim)."""
         try:
             print(f"🌐 Generating embeddings for {len(texts)} texts...")
             self.api_calls_made += 1
@@ -53,7 +71,26 @@ class AzureEmbeddingClient:
                 model=self.embedding_model,
             )
 
-            embeddings = [item.embedding for item in response.data]
+            embeddings = np.asarray([item.embedding for item in response.data], dtype=np.float32)
+            print(f"✅ Successfully generated {len(embeddings)} embeddings (API call #{self.api_calls_made})")
+
+            return embeddings
+
+        except Exception as e:
+            print(f"❌ Error generating embeddings: {e}")
+            raise
+
+    async def agenerate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings using the async Azure OpenAI client."""
+        try:
+            self.api_calls_made += 1
+
+            response = await self.async_client.embeddings.create(
+                input=texts,
+                model=self.embedding_model,
+            )
+
+            embeddings = np.asarray([item.embedding for item in response.data], dtype=np.float32)
             print(f"✅ Successfully generated {len(embeddings)} embeddings (API call #{self.api_calls_made})")
 
             return embeddings
@@ -69,17 +106,40 @@ class AzureEmbeddingClient:
 
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """Calculate cosine similarity between two vectors."""
-    vec1 = np.array(vec1)
-    vec2 = np.array(vec2)
+    v1 = np.asarray(vec1, dtype=np.float32)
+    v2 = np.asarray(vec2, dtype=np.float32)
+
+    if simsimd is not None:
+        if not (v1.any() and v2.any()):
+            return 0.0
+        # Fused dot + norms in a single pass; simsimd returns the cosine distance
+        return 1.0 - float(simsimd.cosine(v1, v2))
 
-    dot_product = np.dot(vec1, vec2)
-    norm1 = np.linalg.norm(vec1)
-    norm2 = np.linalg.norm(vec2)
+    # vdot goes straight to BLAS; one sqrt over the product of both squared norms
+    denom = np.sqrt(np.vdot(v1, v1) * np.vdot(v2, v2))
 
-    if norm1 == 0 or norm2 == 0:
+    if denom == 0:
         return 0.0
 
-    return dot_product / (norm1 * norm2)
+    return float(np.dot(v1, v2) / denom)
+
+
+def cosine_similarity_matrix(matrix1: np.ndarray, matrix2: np.ndarray) -> np.ndarray:
+    """Calculate cosine similarities between every row of matrix1 and every row of matrix2."""
+    if simsimd is not None:
+        # Supports float16 inputs natively; simsimd returns cosine distances
+        similarities = 1.0 - np.asarray(simsimd.cdist(matrix1, matrix2, metric="cosine"))
+        # Zero vectors have no direction, score them 0.0 like the NumPy path instead of simsimd's 1.0
+        similarities[~np.any(matrix1, axis=1), :] = 0.0
+        similarities[:, ~np.any(matrix2, axis=1)] = 0.0
+        return similarities
+
+    m1 = np.asarray(matrix1, dtype=np.float32)
+    m2 = np.asarray(matrix2, dtype=np.float32)
+    m1 = m1 / np.linalg.norm(m1, axis=1, keepdims=True).clip(1e-12)
+    m2 = m2 / np.linalg.norm(m2, axis=1, keepdims=True).clip(1e-12)
+
+    return m1 @ m2.T
 
 
 # generate two embeddings and find similarity
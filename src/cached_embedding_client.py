@@ -0,0 +1,181 @@
+"""
+Embedding client wrapper that persists embeddings on disk by content hash.
+"""
+
+import hashlib
+import pickle
+import re
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .azure_client import AzureEmbeddingClient
+from .embedding_manager import pack_batches
+
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # optional, fuzzy reuse is skipped and only normalized matches are reused
+    fuzz = process = None
+
+
+# Bumped whenever normalization changes, so caches holding aliases made under older rules are dropped
+_CACHE_VERSION = 2
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and collapse whitespace, for near-duplicate cache lookups.
+
+    Symbols are kept: "C++", "C#" and "C" (or ".NET" and "NET") are different skills.
+    """
+    return " ".join(text.lower().split())
+
+
+def _symbols(text: str) -> List[str]:
+    """Non-alphanumeric, non-space characters of a text, in order."""
+    return re.findall(r"[^\w\s]", text)
+
+
+class CachedEmbeddingClient:
+    """Drop-in AzureEmbeddingClient wrapper that only calls the API for texts it has never embedded."""
+
+    def __init__(self, inner: AzureEmbeddingClient, path: Path, fuzzy_threshold: Optional[float] = 95.0):
+        """Wrap an embedding client, caching its results in a pickle file at path.
+
+        Texts that normalize to an already cached text reuse its embedding; with rapidfuzz installed,
+        so do texts whose normalized form scores at least fuzzy_threshold (0-100) against one.
+        Pass fuzzy_threshold=None to disable the fuzzy pass.
+        """
+        self.inner = inner
+        self.path = Path(path)
+        self.embedding_model = inner.embedding_model
+        self.fuzzy_threshold = fuzzy_threshold
+
+        self._cache: Optional[Dict[bytes, np.ndarray]] = None
+        # Normalized text -> cache key of the embedding generated for it
+        self._normalized: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+        self.cache_hits = 0
+        self.near_duplicate_hits = 0
+
+    def _key(self, text: str) -> bytes:
+        """Hash a text together with the embedding model into its cache key."""
+        return hashlib.sha256(f"{self.embedding_model}|{text}".encode()).digest()
+
+    def _load(self) -> Dict[bytes, np.ndarray]:
+        """Load the on-disk cache on first use."""
+        if self._cache is None:
+            self._cache = {}
+            if self.path.exists():
+                try:
+                    with self.path.open("rb") as f:
+                        data = pickle.load(f)
+                    if data.get("version") == _CACHE_VERSION:
+                        self._cache = data["embeddings"]
+                        self._normalized = data["normalized"]
+                        print(f"💾 Loaded {len(self._cache)} cached embeddings from {self.path}")
+                    else:
+                        print(f"⚠️ Ignoring embedding cache {self.path} written by an older version")
+                except Exception as e:
+                    print(f"⚠️ Could not read embedding cache {self.path}: {e}")
+        return self._cache
+
+    def _save(self) -> None:
+        """Write the cache back to disk, replacing the old file atomically."""
+        try:
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with tmp_path.open("wb") as f:
+                pickle.dump(
+                    {"version": _CACHE_VERSION, "embeddings": self._cache, "normalized": self._normalized},
+                    f,
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            tmp_path.replace(self.path)
+        except Exception as e:
+            print(f"⚠️ Could not write embedding cache {self.path}: {e}")
+
+    def _near_duplicate(self, text: str) -> Optional[bytes]:
+        """Find the cache key of a previously embedded text that is a near duplicate of text."""
+        normalized = normalize_text(text)
+        if not normalized:
+            return None
+
+        key = self._normalized.get(normalized)
+        if key is None and process is not None and self.fuzzy_threshold is not None and self._normalized:
+            match = process.extractOne(
+                normalized, list(self._normalized), scorer=fuzz.ratio, score_cutoff=self.fuzzy_threshold)
+            # Near-identical texts that differ in symbols ("C++ developer" vs "C# developer") are different
+            if match is not None and _symbols(match[0]) == _symbols(normalized):
+                key = self._normalized[match[0]]
+        return key
+
+    def _lookup(self, texts: List[str]) -> tuple[List[bytes], List[int]]:
+        """Return the cache key of every text and the indices of the texts that miss."""
+        keys = [self._key(text) for text in texts]
+        missing = []
+        with self._lock:
+            cache = self._load()
+            for i, key in enumerate(keys):
+                if key in cache:
+                    self.cache_hits += 1
+                    continue
+
+                # Second pass: reuse the embedding of a near-duplicate text under this text's own key
+                similar_key = self._near_duplicate(texts[i])
+                if similar_key is not None and similar_key in cache:
+                    cache[key] = cache[similar_key]
+                    self.near_duplicate_hits += 1
+                else:
+                    missing.append(i)
+        return keys, missing
+
+    def _store(self, texts: List[str], keys: List[bytes], embeddings: np.ndarray) -> None:
+        """Add freshly generated embeddings to the cache and persist it."""
+        with self._lock:
+            for text, key, embedding in zip(texts, keys, embeddings, strict=True):
+                self._cache[key] = np.asarray(embedding, dtype=np.float32)
+                self._normalized.setdefault(normalize_text(text), key)
+            self._save()
+
+    def _assemble(self, keys: List[bytes]) -> np.ndarray:
+        """Stack cached embeddings in key order."""
+        if not keys:
+            return np.empty((0, 0), dtype=np.float32)
+        return np.stack([self._cache[key] for key in keys])
+
+    def generate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings, calling the wrapped client only for cache misses."""
+        keys, missing = self._lookup(texts)
+        if missing:
+            fetched = self.inner.generate_embeddings([texts[i] for i in missing])
+            self._store([texts[i] for i in missing], [keys[i] for i in missing], fetched)
+        return self._assemble(keys)
+
+    async def agenerate_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Async variant of generate_embeddings."""
+        keys, missing = self._lookup(texts)
+        if missing:
+            fetched = await self.inner.agenerate_embeddings([texts[i] for i in missing])
+            self._store([texts[i] for i in missing], [keys[i] for i in missing], fetched)
+        return self._assemble(keys)
+
+    def preload(self, texts: List[str]) -> int:
+        """Embed every uncached text ahead of time, returning how many were fetched.
+
+        Misses are sent in as few requests as the per-request input and token limits allow.
+        """
+        unique_texts = list(dict.fromkeys(texts))
+        keys, missing = self._lookup(unique_texts)
+        if missing:
+            batches = pack_batches([unique_texts[i] for i in missing])
+            print(f"📦 Preloading {len(missing)} embeddings in {len(batches)} requests...")
+            for indices in batches:
+                batch = [missing[i] for i in indices]
+                fetched = self.inner.generate_embeddings([unique_texts[i] for i in batch])
+                self._store([unique_texts[i] for i in batch], [keys[i] for i in batch], fetched)
+        return len(missing)
+
+    def get_api_call_count(self) -> int:
+        """Get the number of API calls made by the wrapped client."""
+        return self.inner.get_api_call_count()
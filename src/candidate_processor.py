@@ -2,7 +2,9 @@
 Candidate processing for the matching system.
 """
 
-from typing import List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional
+import numpy as np
 from .models import Candidate, Job, CandidateEvaluation
 from .embedding_manager import EmbeddingManager
 from .matching_engine import MatchingEngine
@@ -16,83 +18,99 @@ class CandidateProcessor:
         self.embedding_manager = embedding_manager
         self.matching_engine = matching_engine
 
-    def add_candidate(self, candidate: Candidate) -> None:
-        """Add a candidate to the system."""
-        print(f"Processing candidate: {candidate.name}")
-
-        # Process each category using model methods
+    def _embeddable_categories(self, candidate: Candidate) -> Dict[str, List]:
+        """Get a candidate's non-empty categories keyed by storage category."""
         categories = {
             "skills": candidate.skills,
             "experience": candidate.experience,
             "education": candidate.education,
             "certifications": candidate.certifications,
         }
+        return {f"candidate_{category}": items for category, items in categories.items() if items}
+
+    def add_candidate(self, candidate: Candidate) -> None:
+        """Add a candidate to the system."""
+        print(f"Processing candidate: {candidate.name}")
+
+        # Embed every category together so cache misses share API calls
+        self.embedding_manager.get_embeddings_multi(
+            self._embeddable_categories(candidate),
+            candidate.name,
+        )
 
-        for category, items in categories.items():
-            if items:
-                self.embedding_manager.get_embeddings_with_storage(
-                    items,
-                    f"candidate_{category}",
-                    candidate.name,
-                )
+    def _merge_candidates(self, candidates: List[Candidate]) -> Dict[str, Dict[str, List]]:
+        """Group the candidates' categories by name, as adding candidates that share a name one by one would."""
+        items_by_candidate: Dict[str, Dict[str, List]] = {}
+        for candidate in candidates:
+            print(f"Processing candidate: {candidate.name}")
+            merged = items_by_candidate.setdefault(candidate.name, {})
+            for category, items in self._embeddable_categories(candidate).items():
+                merged[category] = [*merged.get(category, []), *items]
+
+        return items_by_candidate
 
     def add_candidates(self, candidates: List[Candidate]) -> None:
         """Add multiple candidates to the system."""
-        for candidate in candidates:
-            self.add_candidate(candidate)
+        # Embed all candidates together so texts they share (e.g. "Python") are only sent once
+        self.embedding_manager.get_embeddings_for_candidates(self._merge_candidates(candidates))
+
+    async def aadd_candidate(self, candidate: Candidate) -> None:
+        """Add a candidate to the system, embedding all categories in concurrent requests."""
+        await self.aadd_candidates([candidate])
+
+    async def aadd_candidates(self, candidates: List[Candidate]) -> None:
+        """Add multiple candidates to the system, embedding them together in concurrent requests."""
+        await self.embedding_manager.aget_embeddings_for_candidates(self._merge_candidates(candidates))
 
     def get_candidate_info(self, candidate_name: str) -> Dict[str, Any]:
         """Get candidate information from storage."""
-        # Try to get candidate info from any category
-        for category in ["skills", "experience", "education", "certifications"]:
-            try:
-                results = self.embedding_manager.storage.collection.get(
-                    where={
-                        "$and": [
-                            {"category": f"candidate_{category}"},
-                            {"candidate_name": candidate_name},
-                        ],
-                    },
-                    include=["metadatas"],
-                    limit=1,
-                )
-                if results["metadatas"] and results["metadatas"][0]:
-                    # Look for years_of_experience in metadata
-                    metadata = results["metadatas"][0]
-                    return {
-                        "years_of_experience": metadata.get("years_of_experience", 0.0),
-                    }
-            except:
-                continue
+        # Look up candidate info from any category in a single query
+        candidate_categories = [
+            f"candidate_{category}"
+            for category in ["skills", "experience", "education", "certifications"]
+        ]
+        try:
+            results = self.embedding_manager.storage.collection.get(
+                where={
+                    "$and": [
+                        {"candidate_name": candidate_name},
+                        {"category": {"$in": candidate_categories}},
+                    ],
+                },
+                include=["metadatas"],
+                limit=1,
+            )
+            if results["metadatas"] and results["metadatas"][0]:
+                # Look for years_of_experience in metadata
+                metadata = results["metadatas"][0]
+                return {
+                    "years_of_experience": metadata.get("years_of_experience", 0.0),
+                }
+        except Exception as e:
+            print(f"  ⚠️ Error retrieving candidate info: {e}")
 
         # Default if not found
         return {"years_of_experience": 0.0}
 
-    def evaluate_candidate(self, job: Job, candidate_name: str) -> CandidateEvaluation:
-        """Evaluate a candidate against a job."""
+    def evaluate_candidate(
+        self,
+        job: Job,
+        candidate_name: str,
+        job_embeddings_by_category: Optional[Dict[str, np.ndarray]] = None,
+        job_skill_weights: Optional[np.ndarray] = None,
+    ) -> CandidateEvaluation:
+        """Evaluate a candidate against a job, optionally reusing precomputed job embeddings and skill weights."""
         if not self.matching_engine:
             raise ValueError(
                 "MatchingEngine is required for candidate evaluation")
 
-        category_results = []
-
         # Evaluate each category
-        categories = {
-            "skills": job.skills,
-            "experience": job.experience,
-            "education": job.education,
-            "certifications": job.certifications,
-        }
-
-        for category, requirements in categories.items():
-            if requirements:
-                result = self.matching_engine.match_category(
-                    requirements,
-                    candidate_name,
-                    category,
-                    job,
-                )
-                category_results.append(result)
+        category_results = self.matching_engine.match_job(
+            job,
+            candidate_name,
+            job_embeddings_by_category,
+            job_skill_weights,
+        )
 
         # Calculate overall score
         if category_results:
@@ -105,16 +123,29 @@ class CandidateProcessor:
             candidate_name=candidate_name,
             job_title=job.title,
             overall_score=overall_score,
-            category_results=category_results,
+            category_results=[result.to_pydantic() for result in category_results],
         )
 
     def evaluate_candidates(self, job: Job, candidate_names: List[str]) -> List[CandidateEvaluation]:
         """Evaluate multiple candidates against a job."""
-        evaluations = []
+        if not candidate_names:
+            return []
+
+        if not self.matching_engine:
+            raise ValueError(
+                "MatchingEngine is required for candidate evaluation")
+
+        # Job requirement embeddings and skill weights are the same for every candidate, so compute them once
+        job_embeddings_by_category = self.matching_engine.get_job_embeddings(job)
+        job_skill_weights = np.asarray(job.calculate_skill_weights())
 
-        for candidate_name in candidate_names:
-            evaluation = self.evaluate_candidate(job, candidate_name)
-            evaluations.append(evaluation)
+        # Evaluation is dominated by ChromaDB I/O, so candidates are scored concurrently
+        with ThreadPoolExecutor(max_workers=min(16, len(candidate_names))) as pool:
+            evaluations = list(pool.map(
+                lambda candidate_name: self.evaluate_candidate(
+                    job, candidate_name, job_embeddings_by_category, job_skill_weights),
+                candidate_names,
+            ))
 
         # Sort by overall score (highest first)
         evaluations.sort(key=lambda x: x.overall_score, reverse=True)
@@ -130,12 +161,9 @@ class CandidateProcessor:
         """Get top N matches for a specific category."""
         for category_result in evaluation.category_results:
             if category_result.category == category:
-                # Sort matches by final score
-                sorted_matches = sorted(
-                    category_result.matches,
-                    key=lambda x: x.final_score,
-                    reverse=True,
-                )
+                # Sort matches by final score, highest first and keeping match order on ties
+                order = np.argsort(-category_result.final_scores, kind="stable")
+                sorted_matches = [category_result.matches[i] for i in order]
 
                 return [
                     {
@@ -2,12 +2,56 @@
 Embedding management for candidate matching system.
 """
 
+import asyncio
+import functools
 import hashlib
+import threading
 import time
+from collections import OrderedDict
 from typing import List, Optional, Any, Dict
+import numpy as np
 from .azure_client import AzureEmbeddingClient
 from .embedding_storage import EmbeddingStorage
 
+# Azure ada-002 accepts at most 16 inputs and ~8k tokens per embeddings request
+EMBEDDING_BATCH_SIZE = 16
+EMBEDDING_BATCH_MAX_TOKENS = 7500
+MAX_CONCURRENT_REQUESTS = 8
+
+
+@functools.lru_cache(maxsize=100_000)
+def _hash_key(model: str, text: str) -> str:
+    """Hash a model/text pair into the key used for embedding ids."""
+    return hashlib.blake2b(f"{model}:{text}".encode(), digest_size=16).hexdigest()
+
+
+def _normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """Return the embeddings as L2-normalized float32 rows, the form ChromaDB stores."""
+    normalized = np.array(embeddings, dtype=np.float32)
+    normalized /= np.linalg.norm(normalized, axis=1, keepdims=True).clip(1e-12)
+    return normalized
+
+
+def pack_batches(texts: List[str]) -> List[List[int]]:
+    """Group text indices into request batches, longest first, within the input and token limits."""
+    # Rough token estimate of ~4 characters per token
+    sizes = [len(text) // 4 for text in texts]
+
+    batches: List[List[int]] = []
+    batch_tokens = 0
+    for index in sorted(range(len(texts)), key=lambda i: -sizes[i]):
+        if (
+            not batches
+            or len(batches[-1]) >= EMBEDDING_BATCH_SIZE
+            or batch_tokens + sizes[index] > EMBEDDING_BATCH_MAX_TOKENS
+        ):
+            batches.append([])
+            batch_tokens = 0
+        batches[-1].append(index)
+        batch_tokens += sizes[index]
+
+    return batches
+
 
 class EmbeddingManager:
     """Manages embedding generation and storage with caching."""
@@ -16,22 +60,158 @@ class EmbeddingManager:
         self,
         azure_client: AzureEmbeddingClient,
         storage: EmbeddingStorage,
+        memory_cache_size: int = 20000,
+        candidate_matrix_cache_size: int = 2000,
     ):
-        """Initialize with Azure client and storage."""
+        """Initialize with Azure client, storage and the sizes of the in-process embedding and matrix caches."""
         self.azure_client = azure_client
         self.storage = storage
 
+        # Hot LRU cache in front of ChromaDB, keyed by embedding id
+        self._mem_cache: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._mem_cache_max = memory_cache_size
+        self._mem_cache_lock = threading.Lock()
+
+        # LRU of normalized per-(candidate, category) matrices for matmul-based matching
+        # (matrix in storage dtype, float16 companion built on first request, metadatas, documents, skill scores)
+        self._candidate_matrices: OrderedDict[
+            tuple[str, str], tuple[np.ndarray, Optional[np.ndarray], List[Dict], List[str], np.ndarray]
+        ] = OrderedDict()
+        self._candidate_matrices_max = candidate_matrix_cache_size
+        self._candidate_matrices_lock = threading.Lock()
+
     def get_embeddings_with_storage(
         self,
         # Can be Skill, Experience, Education, Certification, or strings
         items: List[Any],
         category: str,
         candidate_name: Optional[str] = None,
-    ) -> List[List[float]]:
-        """Get embeddings with caching using model methods."""
+    ) -> np.ndarray:
+        """Get embeddings with caching using model methods, as a float32 array of shape (n, dim)."""
+        embeddings, items_to_fetch, fetch_indices, texts_to_fetch = self._probe_storage(
+            items, category, candidate_name)
+
+        # Fetch missing embeddings from API
+        metadatas_to_store = self._prepare_metadatas(items_to_fetch, category)
+        fetched_embeddings = (
+            self.azure_client.generate_embeddings(texts_to_fetch) if texts_to_fetch else None
+        )
+
+        return self._fill_and_store(
+            embeddings,
+            fetch_indices,
+            texts_to_fetch,
+            fetched_embeddings,
+            category,
+            candidate_name,
+            metadatas_to_store,
+        )
+
+    async def aget_embeddings_with_storage(
+        self,
+        items: List[Any],
+        category: str,
+        candidate_name: Optional[str] = None,
+    ) -> np.ndarray:
+        """Get embeddings with caching, fetching misses in concurrent API batches."""
+        embeddings, items_to_fetch, fetch_indices, texts_to_fetch = self._probe_storage(
+            items, category, candidate_name)
+
+        metadatas_to_store = self._prepare_metadatas(items_to_fetch, category)
+        fetched_embeddings = (
+            await self._agenerate_batched(texts_to_fetch) if texts_to_fetch else None
+        )
+
+        return self._fill_and_store(
+            embeddings,
+            fetch_indices,
+            texts_to_fetch,
+            fetched_embeddings,
+            category,
+            candidate_name,
+            metadatas_to_store,
+        )
+
+    def get_embeddings_multi(
+        self,
+        items_by_category: Dict[str, List[Any]],
+        candidate_name: Optional[str] = None,
+    ) -> Dict[str, np.ndarray]:
+        """Get embeddings for several categories, fetching all misses in as few API calls as possible."""
+        return self.get_embeddings_for_candidates({candidate_name: items_by_category})[candidate_name]
+
+    def get_embeddings_for_candidates(
+        self,
+        items_by_candidate: Dict[Optional[str], Dict[str, List[Any]]],
+    ) -> Dict[Optional[str], Dict[str, np.ndarray]]:
+        """Get embeddings for several candidates' categories, fetching the deduplicated misses together."""
+        pending, texts_to_fetch = self._probe_candidates(items_by_candidate)
+        fetched_embeddings = self._generate_batched(texts_to_fetch) if texts_to_fetch else None
+
+        return self._fill_candidates(items_by_candidate, pending, fetched_embeddings)
+
+    async def aget_embeddings_for_candidates(
+        self,
+        items_by_candidate: Dict[Optional[str], Dict[str, List[Any]]],
+    ) -> Dict[Optional[str], Dict[str, np.ndarray]]:
+        """Async variant of get_embeddings_for_candidates, fetching the misses in concurrent API batches."""
+        pending, texts_to_fetch = self._probe_candidates(items_by_candidate)
+        fetched_embeddings = await self._agenerate_batched(texts_to_fetch) if texts_to_fetch else None
+
+        return self._fill_candidates(items_by_candidate, pending, fetched_embeddings)
+
+    def _probe_candidates(
+        self,
+        items_by_candidate: Dict[Optional[str], Dict[str, List[Any]]],
+    ) -> tuple[List[tuple], List[str]]:
+        """Probe every candidate and category first, so misses can share API requests."""
+        pending = []
+        texts_to_fetch = []
+
+        for candidate_name, items_by_category in items_by_candidate.items():
+            for category, items in items_by_category.items():
+                embeddings, items_to_fetch, fetch_indices, texts = self._probe_storage(
+                    items, category, candidate_name)
+                metadatas = self._prepare_metadatas(items_to_fetch, category)
+                pending.append((candidate_name, category, embeddings, fetch_indices, texts, metadatas))
+                texts_to_fetch.extend(texts)
+
+        return pending, texts_to_fetch
+
+    def _fill_candidates(
+        self,
+        items_by_candidate: Dict[Optional[str], Dict[str, List[Any]]],
+        pending: List[tuple],
+        fetched_embeddings: Optional[np.ndarray],
+    ) -> Dict[Optional[str], Dict[str, np.ndarray]]:
+        """Scatter fetched embeddings back to their candidates and categories and store them."""
+        embeddings_by_candidate = {candidate_name: {} for candidate_name in items_by_candidate}
+        offset = 0
+        for candidate_name, category, embeddings, fetch_indices, texts, metadatas in pending:
+            embeddings_by_candidate[candidate_name][category] = self._fill_and_store(
+                embeddings,
+                fetch_indices,
+                texts,
+                fetched_embeddings[offset:offset + len(texts)] if texts else None,
+                category,
+                candidate_name,
+                metadatas,
+            )
+            offset += len(texts)
+
+        return embeddings_by_candidate
+
+    def _probe_storage(
+        self,
+        items: List[Any],
+        category: str,
+        candidate_name: Optional[str] = None,
+    ) -> tuple[List[Optional[np.ndarray]], List[Any], List[int], List[str]]:
+        """Look up cached embeddings, returning placeholders plus the items and texts that miss."""
         embeddings = []
         items_to_fetch = []
         fetch_indices = []
+        missed_texts = []
 
         # Extract texts and check cache
         for i, item in enumerate(items):
@@ -49,43 +229,101 @@ class EmbeddingManager:
                 embeddings.append(None)
                 items_to_fetch.append(item)
                 fetch_indices.append(i)
+                # Keep the text so it is not recomputed for the API call
+                missed_texts.append(text)
 
-        # Fetch missing embeddings from API
-        if items_to_fetch:
-            # Extract texts for API call
-            texts_to_fetch = []
-            metadatas_to_store = []
-
-            for item in items_to_fetch:
-                if hasattr(item, "get_text"):
-                    texts_to_fetch.append(item.get_text())
-                    # Get metadata from model and add category
-                    metadata = item.get_metadata()
-                    metadata["category"] = category
-                    metadatas_to_store.append(metadata)
-                else:
-                    texts_to_fetch.append(str(item))
-                    metadatas_to_store.append({"category": category})
-
-            fetched_embeddings = self.azure_client.generate_embeddings(
-                texts_to_fetch)
-
-            # Update results with fetched embeddings
-            for i, embedding in enumerate(fetched_embeddings):
-                original_index = fetch_indices[i]
-                embeddings[original_index] = embedding
-
-            # Store new embeddings with metadata from models
-            self.store_embeddings(
-                texts_to_fetch,
-                fetched_embeddings,
-                category,
-                candidate_name,
-                metadatas=metadatas_to_store,
-            )
+        return embeddings, items_to_fetch, fetch_indices, missed_texts
+
+    def _prepare_metadatas(self, items_to_fetch: List[Any], category: str) -> List[Dict]:
+        """Collect metadata for storage from the items that missed the cache."""
+        metadatas_to_store = []
+
+        for item in items_to_fetch:
+            if hasattr(item, "get_metadata"):
+                # Copy the model's metadata and add category
+                metadatas_to_store.append({**item.get_metadata(), "category": category})
+            else:
+                metadatas_to_store.append({"category": category})
+
+        return metadatas_to_store
+
+    def _fill_and_store(
+        self,
+        embeddings: List[Optional[np.ndarray]],
+        fetch_indices: List[int],
+        texts_to_fetch: List[str],
+        fetched_embeddings: Optional[np.ndarray],
+        category: str,
+        candidate_name: Optional[str],
+        metadatas_to_store: List[Dict],
+    ) -> np.ndarray:
+        """Assemble cached and fetched embeddings into one array and persist the fetched ones."""
+        if not embeddings:
+            return np.empty((0, 0), dtype=np.float32)
+
+        if fetched_embeddings is None:
+            return np.asarray(embeddings, dtype=np.float32)
+
+        result = np.empty((len(embeddings), fetched_embeddings.shape[1]), dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            if embedding is not None:
+                result[i] = embedding
+
+        # Update results with fetched embeddings, normalized exactly as they are stored so a
+        # later cache hit returns the same vector
+        result[fetch_indices] = _normalize_rows(fetched_embeddings)
+
+        # Store new embeddings with metadata from models
+        self.store_embeddings(
+            texts_to_fetch,
+            fetched_embeddings,
+            category,
+            candidate_name,
+            metadatas=metadatas_to_store,
+        )
+
+        return result
+
+    def _scatter_batches(self, batches: List[List[int]], chunks: List[np.ndarray]) -> np.ndarray:
+        """Put per-batch embeddings back into the original text order."""
+        embeddings = np.empty((sum(map(len, batches)), chunks[0].shape[1]), dtype=np.float32)
+        for indices, chunk in zip(batches, chunks, strict=True):
+            embeddings[indices] = chunk
 
         return embeddings
 
+    def _dedupe_texts(self, texts: List[str]) -> tuple[List[str], List[int]]:
+        """Return the unique texts in first-seen order and, per input text, its row among them."""
+        rows: Dict[str, int] = {}
+        inverse = [rows.setdefault(text, len(rows)) for text in texts]
+        return list(rows), inverse
+
+    def _generate_batched(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings in length-sorted sub-batches that respect the per-request limits."""
+        # Each distinct text is embedded once, duplicates reuse its row
+        unique_texts, inverse = self._dedupe_texts(texts)
+        batches = pack_batches(unique_texts)
+        chunks = [
+            self.azure_client.generate_embeddings([unique_texts[i] for i in indices])
+            for indices in batches
+        ]
+
+        return self._scatter_batches(batches, chunks)[inverse]
+
+    async def _agenerate_batched(self, texts: List[str]) -> np.ndarray:
+        """Generate embeddings in concurrent length-sorted sub-batches, preserving input order."""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        unique_texts, inverse = self._dedupe_texts(texts)
+        batches = pack_batches(unique_texts)
+
+        async def fetch_chunk(indices: List[int]) -> np.ndarray:
+            async with semaphore:
+                return await self.azure_client.agenerate_embeddings([unique_texts[i] for i in indices])
+
+        chunks = await asyncio.gather(*(fetch_chunk(indices) for indices in batches))
+
+        return self._scatter_batches(batches, chunks)[inverse]
+
     def get_statistics(self) -> Dict[str, Any]:
         """Get embedding-related statistics."""
         storage_stats = self.storage.get_storage_statistics()
@@ -104,18 +342,27 @@ class EmbeddingManager:
     def clear_storage(self) -> None:
         """Clear all stored embeddings."""
         self.storage.clear_storage()
+        with self._mem_cache_lock:
+            self._mem_cache.clear()
+        with self._candidate_matrices_lock:
+            self._candidate_matrices.clear()
 
     def _generate_embedding_id(self, text: str, category: str = "general", candidate_name: str = "") -> str:
         """Generate a consistent ID for an embedding."""
-        text_hash = hashlib.md5(
-            f"{self.storage.embedding_model}:{text}".encode()).hexdigest()
-        return f"{category}_{candidate_name}_{text_hash}"
+        return f"{category}_{candidate_name}_{_hash_key(self.storage.embedding_model, text)}"
 
-    def get_embedding(self, text: str, category: str = "general", candidate_name: str = "") -> Optional[List[float]]:
-        """Retrieve embedding from ChromaDB collection if it exists."""
+    def get_embedding(self, text: str, category: str = "general", candidate_name: str = "") -> Optional[np.ndarray]:
+        """Retrieve embedding from the in-process cache or ChromaDB collection if it exists."""
         embedding_id = self._generate_embedding_id(
             text, category, candidate_name)
 
+        with self._mem_cache_lock:
+            embedding = self._mem_cache.get(embedding_id)
+            if embedding is not None:
+                self._mem_cache.move_to_end(embedding_id)
+                self.storage.cache_hits += 1
+                return embedding
+
         try:
             results = self.storage.collection.get(
                 ids=[embedding_id],
@@ -123,60 +370,86 @@ class EmbeddingManager:
             )
 
             if results["ids"] and len(results["ids"]) > 0:
-                self.storage.cache_hits += 1
-                return results["embeddings"][0]
+                embedding = results["embeddings"][0]
+                with self._mem_cache_lock:
+                    self.storage.cache_hits += 1
+                self._cache_embeddings([embedding_id], [embedding])
+                return embedding
 
         except Exception as e:
             print(f"  ⚠️ Error retrieving embedding: {e}")
 
         return None
 
+    def _cache_embeddings(self, embedding_ids: List[str], embeddings: List[np.ndarray]) -> None:
+        """Put embeddings into the in-process LRU cache, evicting the least recently used."""
+        with self._mem_cache_lock:
+            for embedding_id, embedding in zip(embedding_ids, embeddings, strict=False):
+                self._mem_cache[embedding_id] = np.asarray(embedding, dtype=np.float32)
+                self._mem_cache.move_to_end(embedding_id)
+
+            while len(self._mem_cache) > self._mem_cache_max:
+                self._mem_cache.popitem(last=False)
+
     def store_embeddings(
         self,
         texts: List[str],
-        embeddings: List[List[float]],
+        embeddings: np.ndarray,
         category: str = "general",
         candidate_name: Optional[str] = None,
         metadatas: Optional[List[Dict]] = None,
     ) -> None:
         """Store embeddings in ChromaDB collection with optional custom metadata."""
-        ids = []
-        documents = []
-        final_metadatas = []
-        embeddings_to_store = []
-
-        for i, (text, embedding) in enumerate(zip(texts, embeddings, strict=False)):
-            embedding_id = self._generate_embedding_id(
-                text, category, candidate_name or "")
-
-            # Check if already exists to avoid duplicates
-            if self.get_embedding(text, category, candidate_name or "") is None:
-                ids.append(embedding_id)
-                documents.append(text)
-                embeddings_to_store.append(embedding)
-
-                # Base metadata
-                metadata = {
-                    "category": category,
-                    "model": self.storage.embedding_model,
-                    "text_length": len(text),
-                    "cached_at": time.time(),
-                }
-
-                if candidate_name:
-                    metadata["candidate_name"] = candidate_name
+        candidate_ids = [
+            self._generate_embedding_id(text, category, candidate_name or "")
+            for text in texts
+        ]
 
-                # Add custom metadata if provided
-                if metadatas and i < len(metadatas):
-                    metadata.update(metadatas[i])
-
-                final_metadatas.append(metadata)
+        # Check which ids already exist with a single lookup to avoid duplicates
+        try:
+            existing = set(self.storage.collection.get(
+                ids=candidate_ids, include=[])["ids"])
+        except Exception as e:
+            print(f"  ⚠️ Error checking existing embeddings: {e}")
+            existing = set()
+
+        # Positions of embeddings that are not stored yet (also dedupes within the batch)
+        new_indices = []
+        for i, embedding_id in enumerate(candidate_ids[:len(embeddings)]):
+            if embedding_id not in existing:
+                existing.add(embedding_id)
+                new_indices.append(i)
+
+        ids = [candidate_ids[i] for i in new_indices]
+        documents = [texts[i] for i in new_indices]
+
+        # Base metadata shared by the whole batch, custom metadata layered on top
+        base_metadata = {
+            "category": category,
+            "model": self.storage.embedding_model,
+            "cached_at": time.time(),
+        }
+        if candidate_name:
+            base_metadata["candidate_name"] = candidate_name
+
+        final_metadatas = [
+            {
+                **base_metadata,
+                "text_length": text_length,
+                **(metadatas[i] if metadatas and i < len(metadatas) else {}),
+            }
+            for i, text_length in zip(new_indices, map(len, documents), strict=True)
+        ]
 
         if ids:  # Only add if there are new embeddings
+            # float32 up front so SIMD similarity paths skip per-call conversion,
+            # L2-normalized so cosine similarity reduces to a dot product
+            embedding_array = _normalize_rows(np.asarray(embeddings)[new_indices])
+
             try:
                 self.storage.collection.add(
                     ids=ids,
-                    embeddings=embeddings_to_store,
+                    embeddings=embedding_array,
                     documents=documents,
                     metadatas=final_metadatas,
                 )
@@ -184,6 +457,90 @@ class EmbeddingManager:
             except Exception as e:
                 print(f"  ⚠️ Error storing embeddings: {e}")
 
+            # The candidate's matrix for this category is stale now
+            if candidate_name:
+                with self._candidate_matrices_lock:
+                    self._candidate_matrices.pop((candidate_name, category), None)
+
+    def _candidate_entry(
+        self,
+        candidate_name: str,
+        category: str,
+        half_precision: bool = False,
+    ) -> tuple[np.ndarray, Optional[np.ndarray], List[Dict], List[str], np.ndarray]:
+        """Load and memoize a candidate's category as parallel arrays.
+
+        The entry holds the matrix, its float16 companion, metadatas, documents and per-row skill scores.
+        The float16 companion is only built once half_precision is requested, until then it is None.
+        """
+        key = (candidate_name, category)
+        with self._candidate_matrices_lock:
+            cached = self._candidate_matrices.get(key)
+            if cached is not None:
+                self._candidate_matrices.move_to_end(key)
+
+        if cached is None:
+            results = self.storage.collection.get(
+                where={
+                    "$and": [
+                        {"category": category},
+                        {"candidate_name": candidate_name},
+                    ],
+                },
+                include=["embeddings", "metadatas", "documents"],
+            )
+
+            if results["ids"]:
+                matrix = np.asarray(results["embeddings"], dtype=np.float32)
+                matrix = matrix / np.linalg.norm(matrix, axis=1, keepdims=True).clip(1e-12)
+            else:
+                matrix = np.empty((0, 0), dtype=np.float32)
+
+            matrix = matrix.astype(self.storage.dtype, copy=False)
+            metadatas = results["metadatas"] or []
+            # Skill scores pulled out of the metadata dicts once, so scoring can gather them by index
+            skill_scores = np.fromiter(
+                ((metadata or {}).get("skill_score", 3) for metadata in metadatas),
+                dtype=np.float64,
+                count=len(metadatas),
+            )
+            cached = (matrix, None, metadatas, results["documents"] or [], skill_scores)
+
+        elif not half_precision or cached[1] is not None:
+            return cached
+
+        if half_precision:
+            # In float16 storage mode both slots share the one half-precision copy
+            cached = (cached[0], cached[0].astype(np.float16, copy=False), *cached[2:])
+
+        with self._candidate_matrices_lock:
+            self._candidate_matrices[key] = cached
+            self._candidate_matrices.move_to_end(key)
+            while len(self._candidate_matrices) > self._candidate_matrices_max:
+                self._candidate_matrices.popitem(last=False)
+
+        return cached
+
+    def get_candidate_matrix(
+        self,
+        candidate_name: str,
+        category: str,
+        half_precision: bool = False,
+    ) -> tuple[np.ndarray, List[Dict], List[str], np.ndarray]:
+        """Get a candidate's L2-normalized embedding matrix, metadatas, documents and skill scores for a category.
+
+        All four come from one memoized entry, so their rows always line up; a row without a stored
+        skill score gets 3. With half_precision the float16 companion of the matrix is returned, which
+        halves the bytes moved by similarity kernels that support it. Otherwise a float32 matrix is
+        returned, upcast on the fly when the storage keeps float16 copies.
+        """
+        matrix, matrix_f16, metadatas, documents, skill_scores = self._candidate_entry(
+            candidate_name, category, half_precision=half_precision)
+
+        if half_precision:
+            return matrix_f16, metadatas, documents, skill_scores
+        return matrix.astype(np.float32, copy=False), metadatas, documents, skill_scores
+
     def query_candidate_data(
         self,
         query_embedding: List[float],
@@ -192,7 +549,7 @@ class EmbeddingManager:
         n_results: int = 3,
     ) -> Dict:
         """Query for candidate data using vector similarity."""
-        return self.storage.collection.query(
+        results = self.storage.collection.query(
             query_embeddings=[query_embedding],
             n_results=n_results,
             where={
@@ -203,3 +560,12 @@ class EmbeddingManager:
             },
             include=["distances", "documents", "embeddings", "metadatas"],
         )
+        self._warm_cache(results)
+
+        return results
+
+    def _warm_cache(self, results: Dict) -> None:
+        """Populate the in-process cache with embeddings returned by a query."""
+        for ids, embeddings in zip(results.get("ids") or [], results.get("embeddings") or [], strict=False):
+            if ids and embeddings is not None:
+                self._cache_embeddings(ids, embeddings)
@@ -4,21 +4,37 @@ ChromaDB storage manager for embeddings with caching capabilities.
 
 import hashlib
 import time
+from collections import Counter
 from typing import Dict, List, Optional
 import chromadb
+import numpy as np
 
 
 class EmbeddingStorage:
     """Manages embedding storage and retrieval using ChromaDB."""
 
-    def __init__(self, collection_name: str = "skill_embeddings", embedding_model: str = "text-embedding-ada-002"):
-        """Initialize ChromaDB storage."""
+    def __init__(
+        self,
+        collection_name: str = "skill_embeddings",
+        embedding_model: str = "text-embedding-ada-002",
+        dtype: np.dtype = np.float32,
+        persist_directory: str = "./chroma",
+    ):
+        """Initialize ChromaDB storage, persisted under persist_directory.
+
+        dtype sets the precision of the in-process candidate matrices; float16 halves their memory.
+        Cached embeddings of single texts (e.g. job requirements) and ChromaDB itself always keep float32.
+        """
         self.embedding_model = embedding_model
-        self.chroma_client = chromadb.PersistentClient(path="./chroma")
+        self.dtype = np.dtype(dtype)
+        self.chroma_client = chromadb.PersistentClient(path=persist_directory)
         self.collection = self.chroma_client.get_or_create_collection(
             name=collection_name,
             metadata={
-                "description": f"All skill embeddings using {embedding_model}"},
+                "description": f"All skill embeddings using {embedding_model}",
+                # Stored vectors are unit length, so inner product is cosine similarity
+                "hnsw:space": "ip",
+            },
         )
 
         self.cache_hits = 0
@@ -42,25 +58,16 @@ class EmbeddingStorage:
             job_categories = ["job_skills", "job_experience",
                               "job_education", "job_certifications"]
 
-            candidate_count = 0
-            job_count = 0
-
-            for category in candidate_categories:
-                try:
-                    results = self.collection.get(
-                        where={"category": category}, include=["metadatas"])
-                    candidate_count += len(results["ids"]
-                                           ) if results["ids"] else 0
-                except:
-                    pass
-
-            for category in job_categories:
-                try:
-                    results = self.collection.get(
-                        where={"category": category}, include=["metadatas"])
-                    job_count += len(results["ids"]) if results["ids"] else 0
-                except:
-                    pass
+            # Tally every category client-side from a single round-trip
+            results = self.collection.get(
+                where={"category": {"$in": candidate_categories + job_categories}},
+                include=["metadatas"],
+            )
+            category_counts = Counter(
+                metadata.get("category") for metadata in results["metadatas"] or [])
+
+            candidate_count = sum(category_counts[category] for category in candidate_categories)
+            job_count = sum(category_counts[category] for category in job_categories)
 
             return {
                 "cache_hits": self.cache_hits,
@@ -85,7 +92,9 @@ class EmbeddingStorage:
             self.collection = self.chroma_client.create_collection(
                 name="skill_embeddings",
                 metadata={
-                    "description": f"All skill embeddings using {self.embedding_model}"},
+                    "description": f"All skill embeddings using {self.embedding_model}",
+                    "hnsw:space": "ip",
+                },
             )
             print("🗑️ Embedding storage cleared successfully")
         except Exception as e:
@@ -2,27 +2,39 @@
 Core matching engine for candidate evaluation.
 """
 
-from typing import List, Optional
+from typing import Dict, List, Optional
+import numpy as np
 from .models import (
     Job,
     JobRequirement,
     AttributeMatch,
-    CategoryMatch,
-    MatchQuality,
+    AttributeMatchDTO,
+    CategoryMatchDTO,
 )
+from .azure_client import cosine_similarity_matrix
 from .embedding_manager import EmbeddingManager
 
 
 class MatchingEngine:
     """Core engine for matching candidates against job requirements."""
 
-    def __init__(self, embedding_manager: EmbeddingManager):
-        """Initialize with embedding manager."""
+    def __init__(self, embedding_manager: EmbeddingManager, half_precision: bool = False):
+        """Initialize with embedding manager.
+
+        With half_precision, similarities are computed on float16 copies of the candidate embeddings,
+        which halves the memory traffic with SimSIMD installed but rounds the scores slightly.
+        """
         self.embedding_manager = embedding_manager
+        self.half_precision = half_precision
 
-    def _get_match_quality(self, score: float) -> MatchQuality:
-        """Convert score to MatchQuality enum."""
-        return AttributeMatch.get_match_quality_from_score(score)
+    def _get_job_categories(self, job: Job) -> Dict[str, List[JobRequirement]]:
+        """Get job requirements keyed by category."""
+        return {
+            "skills": job.skills,
+            "experience": job.experience,
+            "education": job.education,
+            "certifications": job.certifications,
+        }
 
     def match_category(
         self,
@@ -30,10 +42,10 @@ class MatchingEngine:
         candidate_name: str,
         category: str,
         job: Optional[Job] = None,
-    ) -> CategoryMatch:
+    ) -> CategoryMatchDTO:
         """Match a category of requirements against candidate data."""
         if not job_requirements:
-            return CategoryMatch(category=category, overall_score=0.0, matches=[])
+            return CategoryMatchDTO(category=category, overall_score=0.0, matches=[])
 
         # Get embeddings for job requirements
         job_embeddings = self.embedding_manager.get_embeddings_with_storage(
@@ -41,104 +53,140 @@ class MatchingEngine:
             f"job_{category}",
         )
 
-        matches = []
-        candidate_skills_metadata = []
-        weighted_scores = []
-
-        # First pass: collect all matches and metadata
-        for i, (requirement, job_embedding) in enumerate(zip(job_requirements, job_embeddings, strict=False)):
-            # Query candidate data
-            results = self.embedding_manager.query_candidate_data(
-                query_embedding=job_embedding,
-                candidate_name=candidate_name,
-                category=f"candidate_{category}",
-                n_results=3,
+        return self.match_category_with_embeddings(
+            job_embeddings,
+            job_requirements,
+            candidate_name,
+            category,
+            job,
+        )
+
+    def get_job_embeddings(self, job: Job) -> Dict[str, np.ndarray]:
+        """Get embeddings for every non-empty requirement category of a job."""
+        return {
+            category: self.embedding_manager.get_embeddings_with_storage(
+                requirements,
+                f"job_{category}",
+            )
+            for category, requirements in self._get_job_categories(job).items()
+            if requirements
+        }
+
+    def match_job(
+        self,
+        job: Job,
+        candidate_name: str,
+        job_embeddings_by_category: Optional[Dict[str, np.ndarray]] = None,
+        job_skill_weights: Optional[np.ndarray] = None,
+    ) -> List[CategoryMatchDTO]:
+        """Match every requirement category of a job, reusing precomputed job embeddings and skill weights if given."""
+        if job_embeddings_by_category is None:
+            job_embeddings_by_category = self.get_job_embeddings(job)
+
+        return [
+            self.match_category_with_embeddings(
+                job_embeddings_by_category[category],
+                requirements,
+                candidate_name,
+                category,
+                job,
+                job_skill_weights,
             )
+            for category, requirements in self._get_job_categories(job).items()
+            if requirements
+        ]
+
+    def match_category_with_embeddings(
+        self,
+        job_embeddings: np.ndarray,
+        job_requirements: List[JobRequirement],
+        candidate_name: str,
+        category: str,
+        job: Optional[Job] = None,
+        job_skill_weights: Optional[np.ndarray] = None,
+    ) -> CategoryMatchDTO:
+        """Match a category of requirements whose embeddings are already known.
 
-            if results["documents"] and results["documents"][0]:
-                best_match = results["documents"][0][0]
-                best_distance = results["distances"][0][0]
-                semantic_similarity = max(0.0, 1 - best_distance)
-
-                # Get metadata for skills
-                metadata = results.get("metadatas", [[]])[0]
-                skill_metadata = metadata[0] if metadata and metadata[0] else {}
-
-                if category == "skills":
-                    candidate_skills_metadata.append(skill_metadata)
-                    skill_score = skill_metadata.get("skill_score", 3)
-
-                    match = AttributeMatch(
-                        requirement=requirement.description,
-                        matched_item=best_match,
-                        similarity=semantic_similarity,
-                        proficiency_score=skill_score,
-                        final_score=0.0,  # Will be calculated later with weights
-                        match_quality=MatchQuality.NO_MATCH,  # Will be updated later
-                    )
-                else:
-                    # For non-skills categories, use job requirement weight directly
-                    final_score = semantic_similarity * requirement.weight
-                    match = AttributeMatch(
-                        requirement=requirement.description,
-                        matched_item=best_match,
-                        similarity=semantic_similarity,
-                        final_score=final_score,
-                        match_quality=self._get_match_quality(final_score),
-                    )
-                    weighted_scores.append(final_score)
-
-                matches.append(match)
+        job_skill_weights may hold the job's precomputed skill weights, otherwise they are calculated from job.
+        """
+        if not job_requirements:
+            return CategoryMatchDTO(category=category, overall_score=0.0, matches=[])
+
+        # Load the candidate's embeddings for this category once
+        candidate_matrix, _, candidate_documents, candidate_skill_scores = self.embedding_manager.get_candidate_matrix(
+            candidate_name,
+            f"candidate_{category}",
+            half_precision=self.half_precision,
+        )
+
+        requirement_count = len(job_requirements)
+        matched_items: List[Optional[str]] = [None] * requirement_count
+        similarities = np.zeros(requirement_count)
+        skill_scores = np.full(requirement_count, 3.0)
+
+        if candidate_documents:
+            job_matrix = np.asarray(job_embeddings, dtype=candidate_matrix.dtype)
+
+            # Every requirement-vs-item cosine similarity in a single call, best item per requirement
+            similarity_matrix = cosine_similarity_matrix(job_matrix, candidate_matrix)
+            best_indices = similarity_matrix.argmax(axis=1)
+            similarities = np.clip(
+                similarity_matrix[np.arange(requirement_count), best_indices], 0.0, 1.0).astype(np.float64)
+
+            matched_items = [candidate_documents[j] for j in best_indices]
+            skill_scores = candidate_skill_scores[best_indices]
+
+        found = np.fromiter((item is not None for item in matched_items), dtype=bool, count=requirement_count)
+        is_skills = category == "skills"
+
+        if is_skills:
+            if job:
+                # Use the Job model's weight calculation method (no candidate metadata needed)
+                skill_weights = job.calculate_skill_weights() if job_skill_weights is None else job_skill_weights
+                job_skill_weights = np.zeros(requirement_count)
+                job_skill_weights[:len(skill_weights)] = skill_weights[:requirement_count]
+
+                # Calculate final weighted scores using the formula:
+                # sum(candidate_skill_score * similarity * job_skill_weight)
+                # with the skill score normalized to 0-1; unmatched requirements score zero
+                final_scores = np.where(found, skill_scores / 5.0 * similarities * job_skill_weights, 0.0)
+
+                # For skills, the overall score is the sum of all weighted scores (0-1 range)
+                overall_score = min(1.0, float(final_scores.sum()))
             else:
-                # No match found
-                if category == "skills":
-                    candidate_skills_metadata.append({})
-
-                match = AttributeMatch(
-                    requirement=requirement.description,
-                    matched_item=None,
-                    similarity=0.0,
-                    final_score=0.0,
-                    match_quality=MatchQuality.NO_MATCH,
-                )
-                matches.append(match)
-                weighted_scores.append(0.0)
-
-        # For skills category, calculate sophisticated weights and final scores
-        if category == "skills" and job:
-            # Use the Job model's weight calculation method (no candidate metadata needed)
-            skill_weights = job.calculate_skill_weights()
-
-            # Calculate final weighted scores using the formula:
-            # sum(candidate_skill_score * similarity * job_skill_weight)
-            total_weighted_score = 0.0
-
-            for i, match in enumerate(matches):
-                if match.matched_item:  # Only for matches found
-                    skill_metadata = candidate_skills_metadata[i]
-                    candidate_skill_score = skill_metadata.get("skill_score", 3) / 5.0  # Normalize to 0-1
-                    similarity = match.similarity
-                    job_skill_weight = skill_weights[i] if i < len(skill_weights) else 0.0
-
-                    # Apply the formula
-                    weighted_score = candidate_skill_score * similarity * job_skill_weight
-                    total_weighted_score += weighted_score
-
-                    # Update the match with final score
-                    match.final_score = weighted_score
-                    match.match_quality = self._get_match_quality(weighted_score)
-
-                    weighted_scores.append(weighted_score)
-                else:
-                    weighted_scores.append(0.0)
-
-            # For skills, the overall score is the sum of all weighted scores (0-1 range)
-            overall_score = min(1.0, total_weighted_score)
+                final_scores = np.zeros(requirement_count)
+                overall_score = 0.0
         else:
+            # For non-skills categories, use job requirement weight directly
+            requirement_weights = np.fromiter(
+                (requirement.weight for requirement in job_requirements), dtype=np.float64, count=requirement_count)
+            # Requirement weights are unbounded, so keep each score in the 0-1 range AttributeMatch expects
+            final_scores = np.minimum(similarities * requirement_weights, 1.0)
+
             # For other categories, use average of weighted scores
-            overall_score = sum(weighted_scores) / len(weighted_scores) if weighted_scores else 0.0
+            overall_score = float(final_scores.sum()) / requirement_count
+
+        matches = [
+            AttributeMatchDTO(
+                requirement=requirement.description,
+                matched_item=matched_item,
+                similarity=similarity,
+                proficiency_score=int(skill_score) if is_skills and matched_item is not None else None,
+                final_score=final_score,
+                match_quality=match_quality,
+            )
+            for requirement, matched_item, similarity, skill_score, final_score, match_quality in zip(
+                job_requirements,
+                matched_items,
+                similarities.tolist(),
+                skill_scores.tolist(),
+                final_scores.tolist(),
+                AttributeMatch.classify_batch(final_scores),
+                strict=True,
+            )
+        ]
 
-        return CategoryMatch(
+        return CategoryMatchDTO(
             category=category,
             overall_score=overall_score,
             matches=matches,
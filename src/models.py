@@ -4,25 +4,28 @@ Pydantic models for candidate and job data structures.
 
 from __future__ import annotations
 
-from typing import List, Optional, Dict, Any, Union, Protocol
-from pydantic import BaseModel, Field, validator
+from dataclasses import dataclass, field
+from typing import Annotated, List, Optional, Dict, Any, Union, Protocol
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, field_validator
 from enum import Enum
 
+from . import _weights
 
-# Constants for magic numbers
+
+# Constants for magic numbers; the values live with the numeric kernels in _weights
 class WeightingConstants:
     """Constants for the sophisticated weighting system."""
 
-    EXPERIENCE_THRESHOLD = 5.0
-    CORE_WEIGHT_FACTOR_MAX = 0.6  # At 0 years experience
-    REQUIRED_MULTIPLIER = 3.0     # 3x weight for required skills
-    NICE_TO_HAVE_MULTIPLIER = 1.0  # 1x weight for nice-to-have skills
+    EXPERIENCE_THRESHOLD = _weights.EXPERIENCE_THRESHOLD
+    CORE_WEIGHT_FACTOR_MAX = _weights.CORE_WEIGHT_FACTOR_MAX
+    REQUIRED_MULTIPLIER = _weights.REQUIRED_MULTIPLIER
+    NICE_TO_HAVE_MULTIPLIER = _weights.NICE_TO_HAVE_MULTIPLIER
 
-    # Senior role weights (when core weight becomes 0)
-    TECHNICAL_TOOL_WEIGHT = 0.9
-    TECHNICAL_SOFT_WEIGHT = 0.1
-    LEADERSHIP_TOOL_WEIGHT = 0.4
-    LEADERSHIP_SOFT_WEIGHT = 0.6
+    TECHNICAL_TOOL_WEIGHT = _weights.TECHNICAL_TOOL_WEIGHT
+    TECHNICAL_SOFT_WEIGHT = _weights.TECHNICAL_SOFT_WEIGHT
+    LEADERSHIP_TOOL_WEIGHT = _weights.LEADERSHIP_TOOL_WEIGHT
+    LEADERSHIP_SOFT_WEIGHT = _weights.LEADERSHIP_SOFT_WEIGHT
 
 
 # Enums for type safety
@@ -53,6 +56,27 @@ class MatchQuality(str, Enum):
     NO_MATCH = "No Match"
 
 
+# Integer codes of the enums for the numeric kernels in _weights
+_SKILL_TYPE_CODES = {SkillType.CORE: _weights.CORE, SkillType.SOFT: _weights.SOFT, SkillType.TOOL: _weights.TOOL}
+_ROLE_TYPE_CODES = {RoleType.TECHNICAL: _weights.TECHNICAL, RoleType.LEADERSHIP: _weights.LEADERSHIP}
+
+# Match quality per band index returned by _weights.quality_index
+_QUALITIES = (
+    MatchQuality.NO_MATCH,
+    MatchQuality.VERY_POOR,
+    MatchQuality.POOR,
+    MatchQuality.FAIR,
+    MatchQuality.GOOD,
+    MatchQuality.VERY_GOOD,
+    MatchQuality.EXCELLENT,
+)
+_QUALITIES_ARRAY = np.array(_QUALITIES, dtype=object)
+
+
+# Non-empty, whitespace-stripped string, validated inside pydantic-core
+NonEmptyStr = Annotated[str, StringConstraints(min_length=1, strip_whitespace=True)]
+
+
 # Protocols for type safety
 class Embeddable(Protocol):
     """Protocol for objects that can be embedded."""
@@ -65,13 +89,7 @@ class Embeddable(Protocol):
 class BaseDescriptionModel(BaseModel):
     """Base class for models with description field."""
 
-    description: str = Field(..., description="Description")
-
-    @validator("description")
-    def description_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError(f"{cls.__name__} description cannot be empty")
-        return v.strip()
+    description: NonEmptyStr = Field(..., description="Description")
 
     def get_text(self) -> str:
         """Get the text representation for embedding."""
@@ -85,16 +103,10 @@ class BaseDescriptionModel(BaseModel):
 class Skill(BaseModel):
     """Individual skill with proficiency level."""
 
-    name: str = Field(..., description="Skill name")
+    name: NonEmptyStr = Field(..., description="Skill name")
     score: int = Field(default=3, ge=0, le=5,
                        description="Proficiency level (0-5)")
 
-    @validator("name")
-    def name_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError("Skill name cannot be empty")
-        return v.strip()
-
     def get_text(self) -> str:
         """Get the text representation for embedding."""
         return self.name
@@ -118,30 +130,69 @@ class Certification(BaseDescriptionModel):
     """Certification entry."""
 
 
+def _description_text(item: Any) -> Any:
+    """Description of a description model or dict, other values unchanged."""
+    if isinstance(item, BaseDescriptionModel):
+        return item.description
+    if isinstance(item, dict):
+        return item.get("description")
+    return item
+
+
 class Candidate(BaseModel):
     """Complete candidate profile."""
 
-    name: str = Field(..., description="Candidate name")
+    name: NonEmptyStr = Field(..., description="Candidate name")
     years_of_experience: float = Field(
         default=0.0, ge=0.0, description="Total years of professional experience")
     skills: List[Skill] = Field(
         default_factory=list, description="Technical and professional skills")
-    experience: List[Experience] = Field(
-        default_factory=list, description="Work experience")
-    education: List[Education] = Field(
-        default_factory=list, description="Educational background")
-    certifications: List[Certification] = Field(
-        default_factory=list, description="Certifications and licenses")
-
-    @validator("name")
-    def name_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError("Candidate name cannot be empty")
-        return v.strip()
+    # Description-only entries are stored as plain strings; *_models materializes the models on demand
+    experience: tuple[NonEmptyStr, ...] = Field(
+        default=(), description="Work experience")
+    education: tuple[NonEmptyStr, ...] = Field(
+        default=(), description="Educational background")
+    certifications: tuple[NonEmptyStr, ...] = Field(
+        default=(), description="Certifications and licenses")
+
+    @field_validator("experience", "education", "certifications", mode="before")
+    @classmethod
+    def _coerce_descriptions(cls, value: Any) -> Any:
+        """Accept Experience/Education/Certification models or dicts and keep only their description."""
+        if isinstance(value, (list, tuple)):
+            return tuple(_description_text(item) for item in value)
+        return value
+
+    @property
+    def experience_models(self) -> List[Experience]:
+        """Work experience as Experience models."""
+        return [Experience.model_construct(description=item) for item in self.experience]
+
+    @property
+    def education_models(self) -> List[Education]:
+        """Educational background as Education models."""
+        return [Education.model_construct(description=item) for item in self.education]
+
+    @property
+    def certifications_models(self) -> List[Certification]:
+        """Certifications as Certification models."""
+        return [Certification.model_construct(description=item) for item in self.certifications]
+
+    @property
+    def skills_soa(self) -> tuple[List[str], np.ndarray]:
+        """Skills as parallel columns: names and int8 proficiency scores."""
+        return (
+            [skill.name for skill in self.skills],
+            np.fromiter((skill.score for skill in self.skills), dtype=np.int8, count=len(self.skills)),
+        )
 
     @classmethod
-    def from_dict(cls, name: str, data: Dict[str, Any]) -> "Candidate":
-        """Create Candidate from dictionary."""
+    def from_dict(cls, name: str, data: Dict[str, Any], trusted: bool = False) -> "Candidate":
+        """Create Candidate from dictionary.
+
+        With trusted=True validation is skipped via model_construct; callers must ensure the data
+        already satisfies the model invariants (non-empty stripped strings, scores in 0-5).
+        """
         candidate_data = {"name": name}
 
         # Handle years of experience
@@ -152,39 +203,28 @@ class Candidate(BaseModel):
         if "skills" in data:
             skills_data = data["skills"]
             if skills_data:
+                build_skill = Skill.model_construct if trusted else Skill
                 candidate_data["skills"] = [
-                    Skill(**skill) for skill in skills_data]
+                    build_skill(**skill) for skill in skills_data]
 
-        # Handle other attributes
+        # Handle other attributes (plain description strings)
         for attr in ["experience", "education", "certifications"]:
             if attr in data:
-                attr_class = {
-                    "experience": Experience,
-                    "education": Education,
-                    "certifications": Certification,
-                }[attr]
-                candidate_data[attr] = [attr_class(
-                    description=item) for item in data[attr]]
+                candidate_data[attr] = tuple(data[attr])
 
-        return cls(**candidate_data)
+        return cls.model_construct(**candidate_data) if trusted else cls(**candidate_data)
 
 
 class JobRequirement(BaseModel):
     """Individual job requirement."""
 
-    description: str = Field(..., description="Requirement description")
+    description: NonEmptyStr = Field(..., description="Requirement description")
     weight: float = Field(default=1.0, ge=0.0, description="Importance weight")
     skill_type: SkillType = Field(
         default=SkillType.CORE, description="Skill type: core, soft, or tool")
     required: bool = Field(
         default=True, description="Whether this skill is required or nice-to-have")
 
-    @validator("description")
-    def description_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError("Requirement description cannot be empty")
-        return v.strip()
-
     def get_text(self) -> str:
         """Get the text representation for embedding."""
         return self.description
@@ -197,55 +237,11 @@ class JobRequirement(BaseModel):
             "required": self.required,
         }
 
-    def _calculate_weight_with_linear_core_decrease(
-        self,
-        skill_type: str,
-        job_years_experience: float,
-        job_role_type: str,
-        skill_type_counts: Dict[str, int],
-    ) -> float:
-        """Calculate weight with linear decrease for core skills based on experience."""
-
-        # Calculate core weight factor that decreases linearly from 0.6 to 0 over 5 years
-        # 0 years: 0.6, 1 year: 0.48, 2 years: 0.36, 3 years: 0.24, 4 years: 0.12, 5+ years: 0
-        core_weight_factor = max(0.0, WeightingConstants.CORE_WEIGHT_FACTOR_MAX * (
-            1 - job_years_experience / WeightingConstants.EXPERIENCE_THRESHOLD))
-
-        if skill_type == SkillType.CORE.value:
-            # Core skills get linearly decreasing weight
-            core_count = skill_type_counts.get(SkillType.CORE.value, 0)
-            return core_weight_factor / core_count if core_count > 0 else 0.0
-
-        # For non-core skills, calculate remaining weight distribution
-        remaining_weight = 1.0 - core_weight_factor
-
-        if job_years_experience >= WeightingConstants.EXPERIENCE_THRESHOLD:
-            # For senior positions (5+ years), distribute based on role type
-            role_factors = {
-                RoleType.TECHNICAL.value: {
-                    SkillType.TOOL.value: WeightingConstants.TECHNICAL_TOOL_WEIGHT,
-                    SkillType.SOFT.value: WeightingConstants.TECHNICAL_SOFT_WEIGHT,
-                },
-                RoleType.LEADERSHIP.value: {
-                    SkillType.TOOL.value: WeightingConstants.LEADERSHIP_TOOL_WEIGHT,
-                    SkillType.SOFT.value: WeightingConstants.LEADERSHIP_SOFT_WEIGHT,
-                },
-            }
-
-            factor = role_factors.get(job_role_type, {}).get(skill_type, 0.0)
-            skill_count = skill_type_counts.get(skill_type, 0)
-            return remaining_weight * factor / skill_count if skill_count > 0 else 0.0
-        else:
-            # For junior positions, distribute remaining weight equally among non-core skills
-            other_count = skill_type_counts.get(
-                SkillType.SOFT.value, 0) + skill_type_counts.get(SkillType.TOOL.value, 0)
-            return remaining_weight / other_count if other_count > 0 else 0.0
-
 
 class Job(BaseModel):
     """Complete job specification."""
 
-    title: str = Field(..., description="Job title")
+    title: NonEmptyStr = Field(..., description="Job title")
     role_type: RoleType = Field(
         default=RoleType.TECHNICAL, description="Job role type: technical or leadership")
     years_of_experience: float = Field(
@@ -259,60 +255,50 @@ class Job(BaseModel):
     certifications: List[JobRequirement] = Field(
         default_factory=list, description="Required certifications")
 
-    @validator("title")
-    def title_must_not_be_empty(cls, v):
-        if not v.strip():
-            raise ValueError("Job title cannot be empty")
-        return v.strip()
-
-
+    @property
+    def skills_soa(self) -> tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+        """Skill requirements as parallel columns: descriptions, weights, type codes and required mask."""
+        skill_count = len(self.skills)
+        return (
+            [job_skill.description for job_skill in self.skills],
+            np.fromiter((job_skill.weight for job_skill in self.skills), dtype=np.float64, count=skill_count),
+            np.fromiter(
+                (_SKILL_TYPE_CODES[job_skill.skill_type] for job_skill in self.skills),
+                dtype=np.int8,
+                count=skill_count,
+            ),
+            np.fromiter((job_skill.required for job_skill in self.skills), dtype=bool, count=skill_count),
+        )
 
     def calculate_skill_weights(self) -> List[float]:
         """Calculate weights for all skill requirements based on job parameters."""
         if not self.skills:
             return []
 
-        # Count skills by type from JOB requirements (not candidate)
-        skill_type_counts = {SkillType.CORE.value: 0,
-                             SkillType.SOFT.value: 0, SkillType.TOOL.value: 0}
-        for job_skill in self.skills:
-            skill_type_counts[job_skill.skill_type.value] += 1
-
-        # First pass: calculate unnormalized weights to get normalization factor
-        unnormalized_weights = []
-        for job_skill in self.skills:
-            # Calculate type weight
-            type_weight = job_skill._calculate_weight_with_linear_core_decrease(
-                job_skill.skill_type.value,
-                self.years_of_experience,
-                self.role_type.value,
-                skill_type_counts,
-            )
-
-            # Calculate requirement multiplier
-            requirement_multiplier = (
-                WeightingConstants.REQUIRED_MULTIPLIER if job_skill.required
-                else WeightingConstants.NICE_TO_HAVE_MULTIPLIER
-            )
-
-            # Unnormalized weight (base_weight * type_weight * requirement_multiplier)
-            unnormalized_weight = job_skill.weight * type_weight * requirement_multiplier
-            unnormalized_weights.append(unnormalized_weight)
-
-        # Calculate normalization factor
-        total_unnormalized_weight = sum(unnormalized_weights)
-        
-        # Handle edge case where all weights are 0 (shouldn't happen in normal cases)
-        if total_unnormalized_weight == 0:
-            # Fallback: distribute equally among all skills
-            equal_weight = 1.0 / len(self.skills) if self.skills else 0.0
-            weights = [equal_weight] * len(self.skills)
-        else:
-            normalization_factor = 1.0 / total_unnormalized_weight
-            # Second pass: apply normalization to get final weights
-            weights = [weight * normalization_factor for weight in unnormalized_weights]
-
-        return weights
+        return Job.calculate_skill_weights_batch([self])[0].tolist()
+
+    @staticmethod
+    def calculate_skill_weights_batch(jobs: List["Job"]) -> List[np.ndarray]:
+        """Calculate skill weights for many jobs in a single vectorized pass."""
+        if not jobs:
+            return []
+
+        # Ragged layout: skills of every job concatenated, offsets[i]:offsets[i + 1] belongs to jobs[i]
+        skill_counts = np.fromiter((len(job.skills) for job in jobs), dtype=np.int64, count=len(jobs))
+        offsets = np.zeros(len(jobs) + 1, dtype=np.int64)
+        np.cumsum(skill_counts, out=offsets[1:])
+
+        skill_columns = [job.skills_soa for job in jobs]
+        base_weights = np.concatenate([columns[1] for columns in skill_columns])
+        types = np.concatenate([columns[2] for columns in skill_columns])
+        required = np.concatenate([columns[3] for columns in skill_columns])
+
+        # Per-job parameters
+        years = np.fromiter((job.years_of_experience for job in jobs), dtype=np.float64, count=len(jobs))
+        roles = np.fromiter((_ROLE_TYPE_CODES[job.role_type] for job in jobs), dtype=np.int8, count=len(jobs))
+
+        weights = _weights.skill_weights(types, required, base_weights, skill_counts, years, roles)
+        return np.split(weights, offsets[1:-1])
 
     @classmethod
     def from_dict(
@@ -321,11 +307,18 @@ class Job(BaseModel):
         requirements: Dict[str, List[str]],
         role_type: str = "technical",
         years_of_experience: float = 0.0,
+        trusted: bool = False,
     ) -> "Job":
-        """Create Job from dictionary (backward compatibility)."""
+        """Create Job from dictionary (backward compatibility).
+
+        With trusted=True validation is skipped via model_construct; callers must ensure the
+        title and requirement descriptions are already non-empty stripped strings.
+        """
+        build_requirement = JobRequirement.model_construct if trusted else JobRequirement
         job_data = {
             "title": title,
-            "role_type": role_type,
+            # model_construct does not coerce, so convert the role type explicitly
+            "role_type": RoleType(role_type) if trusted else role_type,
             "years_of_experience": years_of_experience,
         }
 
@@ -335,7 +328,7 @@ class Job(BaseModel):
                     # For skills, we need to handle the new skill_type and required fields
                     # For backward compatibility, assume all skills are core and required
                     job_data[attr] = [
-                        JobRequirement(
+                        build_requirement(
                             description=req,
                             skill_type=SkillType.CORE,
                             required=True,
@@ -343,43 +336,43 @@ class Job(BaseModel):
                         for req in requirements[attr]
                     ]
                 else:
-                    job_data[attr] = [JobRequirement(
+                    job_data[attr] = [build_requirement(
                         description=req) for req in requirements[attr]]
 
-        return cls(**job_data)
+        return cls.model_construct(**job_data) if trusted else cls(**job_data)
+
+
+# Result models are built in bulk by the matching engine and mutated afterwards; keep validation minimal
+_RESULT_MODEL_CONFIG = ConfigDict(validate_assignment=False, extra="ignore", frozen=False)
 
 
 class AttributeMatch(BaseModel):
     """Match result for a single attribute."""
 
+    model_config = _RESULT_MODEL_CONFIG
+
     requirement: str = Field(..., description="Job requirement")
     matched_item: Optional[str] = Field(
         None, description="Best matching candidate item")
+    # Range 0-1 is guaranteed by the matching engine, so it is not re-checked per instance
     similarity: float = Field(
-        0.0, ge=0.0, le=1.0, description="Semantic similarity score")
+        0.0, description="Semantic similarity score")
     proficiency_score: Optional[int] = Field(
         None, description="Candidate proficiency (for skills)")
     final_score: float = Field(
-        0.0, ge=0.0, le=1.0, description="Final weighted score")
+        0.0, description="Final weighted score")
     match_quality: MatchQuality = Field(
         default=MatchQuality.NO_MATCH, description="Human-readable quality rating")
 
     @classmethod
     def get_match_quality_from_score(cls, score: float) -> MatchQuality:
         """Convert score to MatchQuality enum."""
-        if score >= 0.9:
-            return MatchQuality.EXCELLENT
-        if score >= 0.8:
-            return MatchQuality.VERY_GOOD
-        if score >= 0.7:
-            return MatchQuality.GOOD
-        if score >= 0.6:
-            return MatchQuality.FAIR
-        if score >= 0.4:
-            return MatchQuality.POOR
-        if score > 0.0:
-            return MatchQuality.VERY_POOR
-        return MatchQuality.NO_MATCH
+        return _QUALITIES[_weights.quality_index(score)]
+
+    @staticmethod
+    def classify_batch(scores: np.ndarray) -> np.ndarray:
+        """Convert an array of scores to an object array of MatchQuality enums."""
+        return _QUALITIES_ARRAY[_weights.quality_indices(scores)]
 
     def update_quality_from_score(self) -> None:
         """Update match_quality based on final_score."""
@@ -390,6 +383,8 @@ class AttributeMatch(BaseModel):
 class CategoryMatch(BaseModel):
     """Match results for an entire category."""
 
+    model_config = _RESULT_MODEL_CONFIG
+
     category: str = Field(...,
                           description="Category name (skills, experience, etc.)")
     overall_score: float = Field(
@@ -397,10 +392,23 @@ class CategoryMatch(BaseModel):
     matches: List[AttributeMatch] = Field(
         default_factory=list, description="Individual attribute matches")
 
+    @property
+    def final_scores(self) -> np.ndarray:
+        """Final score of every match, in match order, built from the current matches."""
+        return np.fromiter((match.final_score for match in self.matches), dtype=np.float64, count=len(self.matches))
+
+    def get_best_match(self) -> Optional[AttributeMatch]:
+        """Get the match with the highest final score (the first one on ties), None without matches."""
+        if not self.matches:
+            return None
+        return self.matches[int(self.final_scores.argmax())]
+
 
 class CandidateEvaluation(BaseModel):
     """Complete candidate evaluation results."""
 
+    model_config = _RESULT_MODEL_CONFIG
+
     candidate_name: str = Field(..., description="Candidate name")
     job_title: str = Field(..., description="Job title")
     overall_score: float = Field(
@@ -414,3 +422,48 @@ class CandidateEvaluation(BaseModel):
             if result.category == category:
                 return result.overall_score
         return 0.0
+
+
+# Lightweight result carriers used inside scoring; converted to the pydantic models at the API boundary
+@dataclass(slots=True)
+class AttributeMatchDTO:
+    """Match result for a single attribute, without pydantic overhead."""
+
+    requirement: str
+    matched_item: Optional[str] = None
+    similarity: float = 0.0
+    proficiency_score: Optional[int] = None
+    final_score: float = 0.0
+    match_quality: MatchQuality = MatchQuality.NO_MATCH
+
+    def update_quality_from_score(self) -> None:
+        """Update match_quality based on final_score."""
+        self.match_quality = AttributeMatch.get_match_quality_from_score(self.final_score)
+
+    def to_pydantic(self) -> AttributeMatch:
+        """Convert to the pydantic AttributeMatch (values are trusted, so validation is skipped)."""
+        return AttributeMatch.model_construct(
+            requirement=self.requirement,
+            matched_item=self.matched_item,
+            similarity=self.similarity,
+            proficiency_score=self.proficiency_score,
+            final_score=self.final_score,
+            match_quality=self.match_quality,
+        )
+
+
+@dataclass(slots=True)
+class CategoryMatchDTO:
+    """Match results for an entire category, without pydantic overhead."""
+
+    category: str
+    overall_score: float = 0.0
+    matches: List[AttributeMatchDTO] = field(default_factory=list)
+
+    def to_pydantic(self) -> CategoryMatch:
+        """Convert to the pydantic CategoryMatch (values are trusted, so validation is skipped)."""
+        return CategoryMatch.model_construct(
+            category=self.category,
+            overall_score=self.overall_score,
+            matches=[match.to_pydantic() for match in self.matches],
+        )